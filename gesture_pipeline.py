@@ -0,0 +1,656 @@
+# gesture_pipeline.py
+"""
+GestureDrop shared pipeline used by gesture_drop.py and gesture_file_server.py:
+- Flask endpoints: /get_clipboard, /get_clipboard_image, /ip (+ /upload_clipboard when enabled)
+- Camera-based gestures: scroll up/down, tab switch left/right, copy (fist), paste (open palm), screenshot (thumb+index pinch)
+- One camera + one MediaPipe instance per process; entry points only differ in Config
+"""
+
+import os
+import time
+import mimetypes
+import signal
+import socket
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+
+# --- third-party libs ---
+import cv2
+import pyautogui
+import pyperclip
+from flask import Flask, jsonify, request, send_file
+import mediapipe as mp
+
+# ------------- CONFIG -------------
+HEADLESS = os.environ.get('GESTURE_HEADLESS', '0') == '1'   # no preview window (server-only laptops)
+
+@dataclass
+class Config:
+    camera_index: int = 0
+    smoothing_window: int = 6         # number of recent points for smoothing
+    ema_alpha: float = 0.25           # exponential moving average weight for dx/dy (1.0 = no smoothing)
+    scroll_threshold: float = 0.06    # vertical motion threshold (lower = more sensitive)
+    tab_threshold: float = 0.09       # horizontal motion threshold
+    scroll_amount: int = 1200         # pyautogui.scroll clicks per scroll gesture
+    cooldown: float = 0.9             # seconds between recognized motion actions
+    gesture_hold_time: float = 0.45   # sec to hold fist/open to confirm copy/paste
+    screenshot_cooldown: float = 2.5  # sec between screenshots
+    overlay_label_time: float = 1.6   # seconds to display gesture label on screen
+    pinch_dist: float = 0.05          # max thumb-index tip distance (normalized) for screenshot pinch
+    capture_thread: bool = True       # read camera on a background thread (False = drain driver queue inline)
+    drain_depth: int = 4              # max queued frames skipped per read when capture_thread is False
+    capture_width: int = 640          # requested camera resolution (preview window)
+    capture_height: int = 480
+    infer_width: int = 320            # frame width handed to MediaPipe (height keeps aspect ratio)
+    landmarker_model: str = "hand_landmarker.task"   # MediaPipe Tasks model; legacy Hands is used if missing
+    landmarker_gpu: bool = True       # try the GPU delegate first (falls back to CPU)
+    screenshot_dir: str = "screenshots"
+    upload_dir: str = "uploads"       # images uploaded from the phone (enable_upload)
+    port: int = 5000
+    enable_upload: bool = False       # expose /upload_clipboard (phone -> laptop)
+    window_title: str = "GestureDrop – Cross-device"
+    headless: bool = HEADLESS         # skip all drawing, imshow and waitKey
+    render_every: int = 2             # draw the preview on every Nth frame
+    max_render_interval: float = 0.066   # ...but at least this often, so 'q' stays responsive
+
+DRAIN_FRESH_TIME = 0.005   # a grab slower than this waited for a new frame (queue empty)
+COPY_POLL_TIMEOUT = 0.2    # max wait for the OS clipboard to change after Ctrl+C
+COPY_POLL_INTERVAL = 0.01
+
+cached_ip = None   # resolved once by /ip; get_local_ip() opens a socket per call
+
+# ------------- SHARED CLIPBOARD -------------
+class Clipboard:
+    # single item (text OR image) shared between the camera process and the server process.
+    # `store` is a multiprocessing.Manager().dict(); the whole item lives under one key, so
+    # every write is a single atomic swap on the manager and a reader never sees type and
+    # value from different updates (no lock needed). snapshots must be treated as read-only.
+    def __init__(self, store=None):
+        self.store = {} if store is None else store
+        # type: "text" | "image" | "empty"
+        # value: text, or the file path of a screenshot / uploaded image (keeps the entry small)
+        # mimetype: image entries only (screenshots are png)
+        self.store.setdefault('snap', {'type': 'empty', 'value': ''})
+
+    def set_text(self, text):
+        self.store['snap'] = {'type': 'text', 'value': text}
+
+    def set_image(self, value, mimetype='image/png'):
+        self.store['snap'] = {'type': 'image', 'value': value, 'mimetype': mimetype}
+
+    def snapshot(self):
+        return self.store['snap']
+
+# ------------- FLASK (server endpoints) -------------
+def create_app(clipboard, enable_upload=False, upload_dir="uploads"):
+    app = Flask(__name__)
+
+    @app.route('/get_clipboard', methods=['GET'])
+    def api_get_clipboard():
+        # returns {"type":"text"/"empty", "value": "<text>"} or {"type":"image", "url": "/get_clipboard_image"}
+        snap = clipboard.snapshot()
+        if snap['type'] == 'image':
+            return jsonify({"type": "image", "url": "/get_clipboard_image"})
+        return jsonify(snap)
+
+    @app.route('/get_clipboard_image', methods=['GET'])
+    def api_get_clipboard_image():
+        # streams the latest image file as raw bytes (no base64 round trip)
+        snap = clipboard.snapshot()
+        if snap['type'] != 'image':
+            return jsonify({"status": "error", "message": "Clipboard holds no image"}), 404
+        return send_file(snap['value'], mimetype=snap['mimetype'])
+
+    @app.route('/ip', methods=['GET'])
+    def api_ip():
+        global cached_ip
+        if cached_ip is None:
+            cached_ip = get_local_ip()
+        return jsonify({"ip": cached_ip})
+
+    if enable_upload:
+        os.makedirs(upload_dir, exist_ok=True)
+
+        @app.route('/upload_clipboard', methods=['POST'])
+        def api_upload_clipboard():
+            """
+            Accept either:
+            - JSON { "text": "..." }
+            - multipart form with file field name 'image'
+            """
+            # Try JSON text
+            if request.is_json:
+                data = request.get_json()
+                text = data.get("text")
+                if text is not None:
+                    clipboard.set_text(text)
+                    print("[INFO] Uploaded text from phone (len={}):".format(len(text)))
+                    return jsonify({"status": "ok", "type": "text"})
+            # Try file upload (image)
+            if 'image' in request.files:
+                f = request.files['image']
+                mimetype = f.mimetype or ""
+                # the mimetype is client-supplied and served back as-is by /get_clipboard_image:
+                # only accept images (not svg, which can carry script)
+                if not mimetype.startswith("image/") or mimetype == "image/svg+xml":
+                    return jsonify({"status": "error", "message": "Only image uploads are accepted"}), 400
+                # saved to disk like screenshots; only the path goes into the shared entry
+                ext = mimetypes.guess_extension(mimetype) or ".img"
+                fname = os.path.abspath(os.path.join(upload_dir, "upload_{}{}".format(time.time_ns(), ext)))
+                f.save(fname)
+                clipboard.set_image(fname, mimetype)
+                print("[INFO] Uploaded image from phone (size={} bytes)".format(os.path.getsize(fname)))
+                remove_old_uploads(upload_dir, keep=fname)
+                return jsonify({"status": "ok", "type": "image"})
+
+            return jsonify({"status": "error", "message": "No valid payload"}), 400
+
+    return app
+
+def remove_old_uploads(upload_dir, keep):
+    # the clipboard holds a single item, so only the newest upload is worth keeping
+    for name in os.listdir(upload_dir):
+        path = os.path.abspath(os.path.join(upload_dir, name))
+        if name.startswith("upload_") and path != keep:
+            try:
+                os.remove(path)
+            except OSError:
+                pass   # still being sent (Windows keeps open files); retried on the next upload
+
+def run_server(app, port=5000):
+    # Note: If firewall blocks, allow python through firewall
+    # waitress serves requests on a worker pool, so a slow phone download doesn't block the others
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(host='0.0.0.0', port=port, debug=False, use_reloader=False, threaded=True)
+        return
+    serve(app, host='0.0.0.0', port=port, threads=4, _quiet=True)
+
+def server_proc(store, enable_upload=False, port=5000, upload_dir="uploads"):
+    # entry point of the server child process (module-level so it pickles under spawn).
+    # Ctrl+C reaches the whole process group; the parent terminates this process itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    run_server(create_app(Clipboard(store), enable_upload=enable_upload, upload_dir=upload_dir), port)
+
+# ------------- UTIL -------------
+def get_local_ip():
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        s.connect(("8.8.8.8", 80))
+        ip = s.getsockname()[0]
+    except Exception:
+        ip = "127.0.0.1"
+    finally:
+        s.close()
+    return ip
+
+def to_inference_rgb(frame, infer_width):
+    # downscale before the BGR->RGB convert so MediaPipe only sees a small buffer;
+    # the full-size frame is kept for the preview window
+    h, w = frame.shape[:2]
+    if w > infer_width:
+        frame = cv2.resize(frame, (infer_width, round(h * infer_width / w)), interpolation=cv2.INTER_AREA)
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    rgb.flags.writeable = False   # lets MediaPipe skip its defensive copy
+    return rgb
+
+def drain_to_latest(cap, max_drain=4):
+    # grab() only dequeues a packet (no decode); skip queued frames and decode just the newest.
+    # a grab that blocks waited for a brand-new frame, which means the queue is empty.
+    grabbed = False
+    for _ in range(max_drain):
+        t0 = time.perf_counter()
+        if not cap.grab():
+            break
+        grabbed = True
+        if time.perf_counter() - t0 > DRAIN_FRESH_TIME:
+            break
+    if not grabbed:
+        return False, None
+    return cap.retrieve()
+
+class CameraReader:
+    # grabs frames on a daemon thread and keeps only the newest one, so a slow
+    # hands.process() never lets the driver queue back up behind it.
+    # with threaded=False it stays single-threaded and drains the queue on each read instead.
+    def __init__(self, cap, threaded=True, max_drain=4):
+        self.cap = cap
+        self.threaded = threaded
+        self.max_drain = max_drain
+        self._frame = None
+        self._frame_id = 0
+        self._last_id = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        if self.threaded:
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.is_set():
+            ok, f = self.cap.read()
+            if not ok:
+                time.sleep(0.05)
+                continue
+            with self._lock:
+                self._frame = f
+                self._frame_id += 1
+
+    def read_latest(self):
+        # returns the newest frame, or None if nothing new arrived since the last call
+        if not self.threaded:
+            ok, f = drain_to_latest(self.cap, self.max_drain)
+            return f if ok else None
+        with self._lock:
+            if self._frame_id == self._last_id:
+                return None
+            self._last_id = self._frame_id
+            return self._frame
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+
+def open_camera(config):
+    cap = cv2.VideoCapture(config.camera_index)
+    if not cap.isOpened():
+        return None
+    # keep at most one frame queued in the driver so every read is fresh
+    if not cap.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+        print("[WARN] Failed to reduce capture buffer size")
+    # MJPG frames decode faster than raw YUYV on most V4L2/MSMF drivers
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.capture_width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.capture_height)
+    return cap
+
+def safe_set_local_clipboard(text):
+    try:
+        pyperclip.copy(text)
+    except Exception as e:
+        print("[WARN] pyperclip.copy failed:", e)
+
+# slow desktop I/O (clipboard round trips, screen grab + png encode) runs here instead of
+# on the camera loop; a single worker keeps copy -> paste ordering intact
+io_pool = ThreadPoolExecutor(max_workers=1)
+
+def read_local_clipboard():
+    try:
+        return pyperclip.paste()
+    except Exception as e:
+        print("[WARN] pyperclip.paste failed:", e)
+        return ""
+
+def do_copy(state, clipboard):
+    # runs on io_pool: send Ctrl+C, then poll until the OS clipboard changes
+    prev = read_local_clipboard()
+    try:
+        pyautogui.hotkey('ctrl', 'c')
+    except Exception as e:
+        # nothing was copied: the next open palm must not paste the old shared clipboard
+        state.copy_confirmed = False
+        state.io_status = "Copy Failed"
+        print("[ERROR] Copy action failed:", e)
+        return
+    text = prev
+    deadline = time.monotonic() + COPY_POLL_TIMEOUT
+    while time.monotonic() < deadline:
+        cur = read_local_clipboard()
+        if cur and cur != prev:
+            text = cur
+            break
+        time.sleep(COPY_POLL_INTERVAL)
+    # unchanged after the timeout: the selection was already on the clipboard (or nothing copied)
+    if text:
+        clipboard.set_text(text)
+        print("[INFO] Copied & synced (len={}): {}".format(len(text), repr(text[:80])))
+    else:
+        print("[INFO] Copy gesture detected but clipboard empty or non-text")
+
+def do_paste(state, clipboard):
+    # runs on io_pool: place shared text into OS clipboard before paste
+    try:
+        snap = clipboard.snapshot()
+        if snap['type'] == 'text' and snap['value']:
+            safe_set_local_clipboard(snap['value'])
+        pyautogui.hotkey('ctrl', 'v')
+        print("[INFO] Performed paste of shared clipboard")
+    except Exception as e:
+        state.io_status = "Paste Failed"
+        print("[ERROR] Paste failed:", e)
+
+def do_screenshot(state, clipboard, screenshot_dir, ts):
+    # runs on io_pool: grab the desktop, then share the file path
+    try:
+        fname = os.path.join(screenshot_dir, f"screenshot_{ts}.png")
+        pyautogui.screenshot(fname)
+        # share the file path; the server streams the bytes on request
+        clipboard.set_image(os.path.abspath(fname), 'image/png')
+        state.io_status = "Screenshot"
+        print("[INFO] Screenshot saved & synced:", fname)
+    except Exception as e:
+        state.io_status = "Screenshot Failed"
+        print("[ERROR] Screenshot action failed:", e)
+
+# ------------- HAND TRACKING -------------
+class LegacyHandTracker:
+    # mediapipe.solutions.hands: blocking CPU inference on the camera loop
+    def __init__(self):
+        # video mode + lite landmark model: palm detection only re-runs when tracking is lost
+        self.hands = mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=1, model_complexity=0,
+                                              min_detection_confidence=0.5, min_tracking_confidence=0.5)
+
+    def process(self, rgb, now):
+        # returns (NormalizedLandmarkList of the first hand or None, is_new); always a new result here
+        results = self.hands.process(rgb)
+        if results.multi_hand_landmarks:
+            return results.multi_hand_landmarks[0], True
+        return None, True
+
+    def close(self):
+        self.hands.close()
+
+class LiveStreamHandTracker:
+    # MediaPipe Tasks HandLandmarker in LIVE_STREAM mode: detect_async() returns at once and
+    # the result arrives on a MediaPipe thread, so inference overlaps capture + render.
+    # process() hands back the newest finished result, which may lag the input by a frame,
+    # and flags whether it arrived since the previous call.
+    def __init__(self, model_path, use_gpu=True):
+        from mediapipe.tasks.python import BaseOptions, vision
+        from mediapipe.framework.formats import landmark_pb2
+        self._landmark_pb2 = landmark_pb2
+        self._lock = threading.Lock()
+        self._latest = None
+        self._latest_ts = -1     # input timestamp of the result in _latest
+        self._consumed_ts = -1   # ...and of the one process() last reported as new
+        self._last_ts = -1
+        delegate = BaseOptions.Delegate.GPU if use_gpu else BaseOptions.Delegate.CPU
+        options = vision.HandLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=model_path, delegate=delegate),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_hands=1,
+            min_hand_detection_confidence=0.5,
+            min_hand_presence_confidence=0.5,
+            min_tracking_confidence=0.5,
+            result_callback=self._on_result)
+        self.landmarker = vision.HandLandmarker.create_from_options(options)
+
+    def _on_result(self, result, image, timestamp_ms):
+        lm = None
+        if result.hand_landmarks:
+            # same proto type the legacy solution returns, so drawing/gesture code is shared
+            pb2 = self._landmark_pb2
+            lm = pb2.NormalizedLandmarkList()
+            lm.landmark.extend(pb2.NormalizedLandmark(x=p.x, y=p.y, z=p.z) for p in result.hand_landmarks[0])
+        with self._lock:
+            self._latest = lm
+            self._latest_ts = timestamp_ms
+
+    def process(self, rgb, now):
+        ts = int(now * 1000)
+        if ts > self._last_ts:   # timestamps must strictly increase
+            self._last_ts = ts
+            self.landmarker.detect_async(mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb), ts)
+        with self._lock:
+            lm, result_ts = self._latest, self._latest_ts
+        is_new = result_ts != self._consumed_ts
+        self._consumed_ts = result_ts
+        return lm, is_new
+
+    def close(self):
+        self.landmarker.close()
+
+def create_hand_tracker(config):
+    if config.landmarker_model and os.path.exists(config.landmarker_model):
+        for use_gpu in ((True, False) if config.landmarker_gpu else (False,)):
+            try:
+                tracker = LiveStreamHandTracker(config.landmarker_model, use_gpu=use_gpu)
+                print("[INFO] Using HandLandmarker LIVE_STREAM ({})".format("GPU" if use_gpu else "CPU"))
+                return tracker
+            except Exception as e:
+                print("[WARN] HandLandmarker ({}) unavailable: {}".format("GPU" if use_gpu else "CPU", e))
+    return LegacyHandTracker()
+
+# ------------- GESTURE HELPERS -------------
+def finger_states_from_landmarks(lm):
+    # returns list of five ints 1=open, 0=closed (thumb,index,middle,ring,pinky).
+    # plain scalar compares on the 10 landmarks involved; a NumPy gather costs more than it saves here
+    p = lm.landmark
+    return [
+        # thumb: compare x to its lower joint; frame is unmirrored, so this is the
+        # mirrored "tip left of joint" check flipped around
+        int(p[4].x > p[2].x),
+        int(p[8].y < p[6].y),
+        int(p[12].y < p[10].y),
+        int(p[16].y < p[14].y),
+        int(p[20].y < p[18].y),
+    ]
+
+class GestureState:
+    # per-run gesture trackers (smoothing, hold timers, overlay label).
+    # all times are time.monotonic() values; cooldowns/holds are stored as absolute deadlines
+    def __init__(self, config):
+        self.config = config
+        self.pos_history = deque(maxlen=config.smoothing_window)   # last (x,y) points (index tip), oldest evicted
+        self.ema_dx = 0.0
+        self.ema_dy = 0.0
+        self.next_action_time = 0.0
+        self.fist_confirm_at = None   # fist held until this time -> copy
+        self.open_confirm_at = None   # open palm held until this time -> paste
+        self.copy_confirmed = False
+        self.next_screenshot_time = 0.0
+        self.gesture_label = "None"
+        self.label_until = 0.0
+        self.io_status = None   # set by io workers, shown as the gesture label on the next frame
+        # motion gestures keyed by (axis, sign of the EMA delta); y grows downward
+        self.motion_actions = {
+            ('y', -1): (partial(pyautogui.scroll, config.scroll_amount), "Scroll Up"),
+            ('y', 1): (partial(pyautogui.scroll, -config.scroll_amount), "Scroll Down"),
+            ('x', 1): (partial(pyautogui.hotkey, 'ctrl', 'tab'), "Next Tab"),
+            ('x', -1): (partial(pyautogui.hotkey, 'ctrl', 'shift', 'tab'), "Previous Tab"),
+        }
+
+    def set_label(self, label, now):
+        self.gesture_label = label
+        self.label_until = now + self.config.overlay_label_time
+
+    def update_motion_and_detect(self, dx, dy, now):
+        # uses EMA smoothing to reduce jitter and detect motion gestures
+        cfg = self.config
+        self.ema_dx = (cfg.ema_alpha * dx) + (1 - cfg.ema_alpha) * self.ema_dx
+        self.ema_dy = (cfg.ema_alpha * dy) + (1 - cfg.ema_alpha) * self.ema_dy
+
+        if now < self.next_action_time:
+            return None
+
+        # Use magnitude of EMA values for decisions
+        abs_dx = abs(self.ema_dx)
+        abs_dy = abs(self.ema_dy)
+
+        # dominant axis picks scroll (vertical) vs tab switch (horizontal)
+        if abs_dy > abs_dx:
+            if abs_dy <= cfg.scroll_threshold:
+                return None
+            axis, delta = 'y', self.ema_dy
+        elif abs_dx > abs_dy:
+            if abs_dx <= cfg.tab_threshold:
+                return None
+            axis, delta = 'x', self.ema_dx
+        else:
+            return None
+
+        action, label = self.motion_actions[(axis, 1 if delta > 0 else -1)]
+        action()
+        self.set_label(label, now)
+        self.next_action_time = now + cfg.cooldown
+        return label
+
+# ------------- MAIN (camera loop) -------------
+def run(config=None):
+    config = config or Config()
+    state = GestureState(config)
+
+    local_ip = get_local_ip()
+    print("\nGestureDrop running. Phone UI: http://{}:{} (open mobile HTML and press Connect)".format(local_ip, config.port))
+    if config.headless:
+        print("Running headless (no preview). Press Ctrl+C to quit.")
+    else:
+        print("Press 'q' in camera window to quit.")
+    server_info = f"Server: http://{local_ip}:{config.port}"
+
+    # start server process: HTTP work (large image sends, uploads) never competes with
+    # the camera loop for the GIL; the clipboard is shared through a Manager dict
+    manager = multiprocessing.Manager()
+    clipboard = Clipboard(manager.dict())
+    server = multiprocessing.Process(target=server_proc,
+                                     args=(clipboard.store, config.enable_upload, config.port, config.upload_dir),
+                                     daemon=True)
+    server.start()
+
+    cap = reader = tracker = None
+    try:
+        # ensure screenshots dir
+        os.makedirs(config.screenshot_dir, exist_ok=True)
+
+        cap = open_camera(config)
+        if cap is None:
+            print("[ERROR] Cannot open camera.")
+            return
+        reader = CameraReader(cap, threaded=config.capture_thread, max_drain=config.drain_depth).start()
+
+        mp_hands = mp.solutions.hands
+        mp_drawing = mp.solutions.drawing_utils
+        tracker = create_hand_tracker(config)
+        frame_idx = 0
+        next_render_time = 0.0
+
+        while True:
+            frame = reader.read_latest()
+            if frame is None:
+                time.sleep(0.002)
+                continue
+            now = time.monotonic()   # one clock read per frame, shared by every gesture timer
+            frame_idx += 1
+            render = not config.headless and (frame_idx % config.render_every == 0 or now >= next_render_time)
+
+            # frame stays unmirrored for inference; landmark x is mirrored instead
+            # and only the preview gets flipped, right before the overlay is drawn
+            lm, is_new = tracker.process(to_inference_rgb(frame, config.infer_width), now)
+
+            if lm is not None and render:
+                mp_drawing.draw_landmarks(frame, lm, mp_hands.HAND_CONNECTIONS)
+
+            # a LIVE_STREAM result already seen on an earlier frame is only drawn: feeding it
+            # again would repeat a sample in pos_history/EMA and shrink dx/dy
+            if is_new and lm is not None:
+                idx = lm.landmark[8]
+                th = lm.landmark[4]
+                x, y = 1.0 - float(idx.x), float(idx.y)
+
+                # update position history and compute dx,dy over window
+                pos_history = state.pos_history
+                pos_history.append((x,y))
+
+                if len(pos_history) >= 2:
+                    dx = pos_history[-1][0] - pos_history[0][0]
+                    dy = pos_history[-1][1] - pos_history[0][1]
+                else:
+                    dx = dy = 0.0
+
+                # detect motion gestures using EMA smoothing
+                # label will be set inside update_motion_and_detect
+                state.update_motion_and_detect(dx, dy, now)
+
+                # finger states
+                fingers = finger_states_from_landmarks(lm)
+                total_f = sum(fingers)
+
+                # COPY gesture: fist (all fingers closed)
+                if total_f == 0:
+                    if state.fist_confirm_at is None:
+                        state.fist_confirm_at = now + config.gesture_hold_time
+                    elif now > state.fist_confirm_at and not state.copy_confirmed:
+                        # execute copy and sync off the camera loop; the flag is set first so
+                        # do_copy can clear it again if the hotkey fails
+                        state.set_label("Copy", now)
+                        state.copy_confirmed = True
+                        io_pool.submit(do_copy, state, clipboard)
+                        state.fist_confirm_at = None
+                else:
+                    state.fist_confirm_at = None
+
+                # PASTE gesture: open palm (all fingers open)
+                if total_f == 5:
+                    if state.open_confirm_at is None:
+                        state.open_confirm_at = now + config.gesture_hold_time
+                    elif now > state.open_confirm_at and state.copy_confirmed:
+                        # queued behind any pending copy on the same worker
+                        io_pool.submit(do_paste, state, clipboard)
+                        state.set_label("Paste", now)
+                        state.copy_confirmed = False
+                        state.open_confirm_at = None
+                else:
+                    state.open_confirm_at = None
+
+                # Screenshot gesture: thumb+index pinch (thumb open, index open, others closed) and small distance
+                if fingers[0] == 1 and fingers[1] == 1 and not any(fingers[2:]):
+                    # squared distance: only a threshold check follows, so skip the sqrt
+                    pinch_dx = th.x - idx.x
+                    pinch_dy = th.y - idx.y
+                    if (pinch_dx * pinch_dx + pinch_dy * pinch_dy < config.pinch_dist * config.pinch_dist
+                            and now > state.next_screenshot_time):
+                        # wall-clock seconds only name the file
+                        io_pool.submit(do_screenshot, state, clipboard, config.screenshot_dir, int(time.time()))
+                        state.next_screenshot_time = now + config.screenshot_cooldown
+
+            elif is_new:
+                # no hand
+                state.pos_history.clear()
+                # reset interim holds but keep copy_confirmed until used
+                state.fist_confirm_at = None
+                state.open_confirm_at = None
+
+            if state.io_status is not None:
+                status, state.io_status = state.io_status, None
+                state.set_label(status, now)
+
+            if not render:
+                continue
+            next_render_time = now + config.max_render_interval
+
+            cv2.flip(frame, 1, dst=frame)
+
+            # overlay label and server IP
+            if now < state.label_until:
+                cv2.putText(frame, state.gesture_label, (20,50), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0,255,255), 2)
+            else:
+                cv2.putText(frame, "Gesture: None", (20,50), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (150,150,150), 2)
+
+            cv2.putText(frame, server_info, (20, frame.shape[0]-20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200,200,200), 1)
+
+            cv2.imshow(config.window_title, frame)
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+    finally:
+        # also reached on Ctrl+C, the only way to quit in headless mode
+        if reader is not None:
+            reader.stop()
+        if cap is not None:
+            cap.release()
+        if tracker is not None:
+            tracker.close()
+        server.terminate()
+        manager.shutdown()
+        # last, and only with a window: GUI-less OpenCV builds raise here
+        if not config.headless:
+            cv2.destroyAllWindows()
+    print("Exiting GestureDrop.")